@@ -1,6 +1,8 @@
-from fastapi import Body, FastAPI
+import orjson
+from fastapi import Body, FastAPI, Response
+from fastapi.responses import ORJSONResponse
 
-app: FastAPI = FastAPI()
+app: FastAPI = FastAPI(default_response_class=ORJSONResponse)
 
 BOOKS: list[dict[str, str]] = [
     {"title": "Title One", "author": "Author One", "category": "science"},
@@ -11,6 +13,135 @@ BOOKS: list[dict[str, str]] = [
     {"title": "Title Six", "author": "Author Two", "category": "math"},
 ]
 
+# Secondary indexes over BOOKS, keyed by casefolded field values.
+_by_title: dict[str, dict[str, str]] = {}
+_by_category: dict[str, list[dict[str, str]]] = {}
+_by_author: dict[str, list[dict[str, str]]] = {}
+# Casefolded (title, category, author) per indexed book, keyed by id(book).
+_folded: dict[int, tuple[str, str, str]] = {}
+# Encoded JSON body for GET /books, rebuilt lazily after any mutation.
+_books_json: bytes | None = None
+
+
+def _render_books() -> bytes:
+    """
+    Encode BOOKS to JSON and cache the bytes until the next mutation.
+    Returns:
+        bytes: The JSON-encoded list of books.
+    """
+    global _books_json
+    _books_json = orjson.dumps(BOOKS)
+    return _books_json
+
+
+def _invalidate_books() -> None:
+    """
+    Drop the cached JSON body for GET /books.
+    """
+    global _books_json
+    _books_json = None
+
+
+def _fold(value: str) -> str:
+    """
+    Casefold a string, taking the cheaper str.lower() path for ASCII input.
+    Args:
+        value (str): The string to fold.
+    Returns:
+        str: The folded string, usable as an index key.
+    """
+    return value.lower() if value.isascii() else value.casefold()
+
+
+def _prepare(book: dict[str, str]) -> tuple[str, str, str]:
+    """
+    Casefold a book's title, category and author once and cache the result.
+    Args:
+        book (dict[str, str]): The book dictionary to prepare.
+    Returns:
+        tuple[str, str, str]: The casefolded title, category and author.
+    """
+    keys = (
+        _fold(book.get("title", "")),
+        _fold(book.get("category", "")),
+        _fold(book.get("author", "")),
+    )
+    _folded[id(book)] = keys
+    return keys
+
+
+def _remove_book(books: list[dict[str, str]], book: dict[str, str]) -> None:
+    """
+    Remove a book from a list by identity.
+    Args:
+        books (list[dict[str, str]]): The list to remove the book from.
+        book (dict[str, str]): The book dictionary to remove.
+    """
+    for i, item in enumerate(books):
+        if item is book:
+            del books[i]
+            return
+
+
+def _index_book(book: dict[str, str]) -> None:
+    """
+    Add a book to the title, category and author indexes.
+    Args:
+        book (dict[str, str]): The book dictionary to index.
+    """
+    title, category, author = _prepare(book)
+    _by_title.setdefault(title, book)
+    _by_category.setdefault(category, []).append(book)
+    _by_author.setdefault(author, []).append(book)
+
+
+def _unindex_book(book: dict[str, str]) -> None:
+    """
+    Remove a book from the title, category and author indexes.
+    Args:
+        book (dict[str, str]): The book dictionary to remove.
+    """
+    title, category, author = _folded.pop(id(book))
+    if _by_title.get(title) is book:
+        del _by_title[title]
+        # Fall back to the next book sharing the same title, if any.
+        for other in BOOKS:
+            if other is not book and _folded.get(id(other), ("",))[0] == title:
+                _by_title[title] = other
+                break
+    _remove_book(_by_category.get(category, []), book)
+    _remove_book(_by_author.get(author, []), book)
+
+
+def _replace_book(old_book: dict[str, str], new_book: dict[str, str]) -> None:
+    """
+    Swap a book for its updated version in every index, keeping BOOKS order.
+    The updated book must already have replaced the old one in BOOKS.
+    Args:
+        old_book (dict[str, str]): The book dictionary being replaced.
+        new_book (dict[str, str]): The updated book dictionary.
+    """
+    old_keys = _folded.pop(id(old_book))
+    new_keys = _prepare(new_book)
+    # update_book finds the book through this title key, so it still maps here.
+    _by_title[new_keys[0]] = new_book
+    for index, field in ((_by_category, 1), (_by_author, 2)):
+        books = index[old_keys[field]]
+        if old_keys[field] == new_keys[field]:
+            for i, item in enumerate(books):
+                if item is old_book:
+                    books[i] = new_book
+                    break
+        else:
+            _remove_book(books, old_book)
+            index[new_keys[field]] = [
+                book for book in BOOKS if _folded[id(book)][field] == new_keys[field]
+            ]
+
+
+for _book in BOOKS:
+    _index_book(_book)
+
 
 @app.get("/")
 def main_page() -> dict[str, str]:
@@ -21,13 +152,13 @@ def main_page() -> dict[str, str]:
     return {"message": "Welcome to the Books API!"}
 
 
-@app.get("/books")
-async def read_all_books() -> list[dict[str, str]]:
+@app.get("/books", response_model=list[dict[str, str]])
+async def read_all_books() -> Response:
     """
     Get all books in the collection.
-    Returns a list of all book dictionaries.
+    Returns a list of all book dictionaries, served from the cached encoding.
     """
-    return BOOKS
+    return Response(_books_json or _render_books(), media_type="application/json")
 
 
 @app.get("/books/{book_title}")
@@ -39,9 +170,7 @@ async def read_book(book_title: str) -> dict[str, str] | None:
     Returns:
         dict[str, str] | None: The book dictionary if found, else None.
     """
-    for book in BOOKS:
-        if book.get("title").casefold() == book_title.casefold():
-            return book
+    return _by_title.get(_fold(book_title))
 
 
 @app.get("/books/")
@@ -53,11 +182,7 @@ async def read_category_by_query(category: str) -> list[dict[str, str]]:
     Returns:
         list[dict[str, str]]: List of books in the given category.
     """
-    books_to_return: list[dict[str, str]] = []
-    for book in BOOKS:
-        if book.get("category").casefold() == category.casefold():
-            books_to_return.append(book)
-    return books_to_return
+    return list(_by_category.get(_fold(category), []))
 
 
 @app.get("/books/byauthor/")
@@ -69,11 +194,7 @@ async def read_books_by_author_path(author: str) -> list[dict[str, str]]:
     Returns:
         list[dict[str, str]]: List of books by the given author.
     """
-    books_to_return: list[dict[str, str]] = []
-    for book in BOOKS:
-        if book.get("author").casefold() == author.casefold():
-            books_to_return.append(book)
-    return books_to_return
+    return list(_by_author.get(_fold(author), []))
 
 
 @app.get("/books/{book_author}/")
@@ -88,14 +209,10 @@ async def read_author_category_by_query(
     Returns:
         list[dict[str, str]]: List of books by the given author and category.
     """
-    books_to_return: list[dict[str, str]] = []
-    for book in BOOKS:
-        if (
-            book.get("author").casefold() == book_author.casefold()
-            and book.get("category").casefold() == category.casefold()
-        ):
-            books_to_return.append(book)
-    return books_to_return
+    by_author = {id(book) for book in _by_author.get(_fold(book_author), [])}
+    return [
+        book for book in _by_category.get(_fold(category), []) if id(book) in by_author
+    ]
 
 
 @app.post("/books/create_book")
@@ -106,6 +223,8 @@ async def create_book(new_book: dict = Body()) -> None:
         new_book (dict): The book dictionary to add.
     """
     BOOKS.append(new_book)
+    _index_book(new_book)
+    _invalidate_books()
 
 
 @app.put("/books/update_book")
@@ -115,9 +234,15 @@ async def update_book(updated_book: dict = Body()) -> None:
     Args:
         updated_book (dict): The updated book dictionary.
     """
-    for i in range(len(BOOKS)):
-        if BOOKS[i].get("title").casefold() == updated_book.get("title").casefold():
+    old_book = _by_title.get(_fold(updated_book.get("title", "")))
+    if old_book is None:
+        return
+    for i, book in enumerate(BOOKS):
+        if book is old_book:
             BOOKS[i] = updated_book
+            break
+    _replace_book(old_book, updated_book)
+    _invalidate_books()
 
 
 @app.delete("/books/delete_book/{book_title}")
@@ -127,7 +252,9 @@ async def delete_book(book_title: str) -> None:
     Args:
         book_title (str): The title of the book to delete.
     """
-    for i in range(len(BOOKS)):
-        if BOOKS[i].get("title").casefold() == book_title.casefold():
-            BOOKS.pop(i)
-            break
+    book = _by_title.get(_fold(book_title))
+    if book is None:
+        return
+    _remove_book(BOOKS, book)
+    _unindex_book(book)
+    _invalidate_books()
@@ -0,0 +1,42 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+
+import books
+
+client = TestClient(books.app)
+
+
+def test_update_with_duplicate_titles_keeps_indexes_in_order():
+    first = {"title": "Twin", "author": "Author A", "category": "science"}
+    second = {"title": "twin", "author": "Author B", "category": "science"}
+    client.post("/books/create_book", json=first)
+    client.post("/books/create_book", json=second)
+    try:
+        updated = {"title": "Twin", "author": "Author A", "category": "math"}
+        response = client.put("/books/update_book", json=updated)
+        assert response.status_code == status.HTTP_200_OK
+        assert client.get("/books/Twin").json() == updated
+
+        math = client.get("/books/", params={"category": "math"}).json()
+        assert math == [book for book in books.BOOKS if book["category"] == "math"]
+        assert math[-1] == updated
+
+        client.delete("/books/delete_book/Twin")
+        assert client.get("/books/twin").json() == second
+        assert updated not in client.get("/books").json()
+    finally:
+        client.delete("/books/delete_book/twin")
+        client.delete("/books/delete_book/Twin")
+
+
+def test_update_in_place_keeps_category_position():
+    original = list(books.BOOKS)
+    updated = {"title": "Title One", "author": "Author Nine", "category": "science"}
+    try:
+        client.put("/books/update_book", json=updated)
+        science = client.get("/books/", params={"category": "science"}).json()
+        assert science[0] == updated
+        by_author = client.get("/books/byauthor/", params={"author": "author nine"})
+        assert by_author.json() == [updated]
+    finally:
+        client.put("/books/update_book", json=original[0])
@@ -1,9 +1,10 @@
 from typing import Optional, List
 from fastapi import FastAPI, Path, Query, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from starlette import status
 
-app: FastAPI = FastAPI()
+app: FastAPI = FastAPI(default_response_class=ORJSONResponse)
 
 
 class Book(BaseModel):
@@ -95,6 +96,11 @@ BOOKS: List[Book] = [
     ),
 ]
 
+# Index of BOOKS by ID; BOOKS keeps insertion order for listing.
+_by_id: dict[int, Book] = {book.id: book for book in BOOKS}
+# Next ID to hand out; only ever increases, so IDs are never reused after deletes.
+_next_id: int = max((book.id for book in BOOKS), default=0) + 1
+
 
 @app.get("/books", status_code=status.HTTP_200_OK)
 async def read_all_books() -> List[Book]:
@@ -117,10 +123,10 @@ async def read_book(book_id: int = Path(gt=0)) -> Book:
     Raises:
         HTTPException: If the book is not found.
     """
-    for book in BOOKS:
-        if book.id == book_id:
-            return book
-    raise HTTPException(status_code=404, detail="Item not found")
+    book = _by_id.get(book_id)
+    if book is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return book
 
 
 @app.get("/books/", status_code=status.HTTP_200_OK)
@@ -132,11 +138,7 @@ async def read_book_by_rating(book_rating: int = Query(gt=0, lt=6)) -> List[Book
     Returns:
         list[Book]: List of books with the given rating.
     """
-    books_to_return: List[Book] = []
-    for book in BOOKS:
-        if book.rating == book_rating:
-            books_to_return.append(book)
-    return books_to_return
+    return [book for book in BOOKS if book.rating == book_rating]
 
 
 @app.get("/books/publish/", status_code=status.HTTP_200_OK)
@@ -150,11 +152,7 @@ async def read_books_by_publish_date(
     Returns:
         list[Book]: List of books published in the given year.
     """
-    books_to_return: List[Book] = []
-    for book in BOOKS:
-        if book.published_date == published_date:
-            books_to_return.append(book)
-    return books_to_return
+    return [book for book in BOOKS if book.published_date == published_date]
 
 
 @app.post("/create-book", status_code=status.HTTP_201_CREATED)
@@ -164,19 +162,23 @@ async def create_book(book_request: BookRequest) -> None:
     Args:
         book_request (BookRequest): The book data to create.
     """
-    new_book = Book(**book_request.model_dump())
+    # BookRequest is already validated, so skip re-validating into Book.
+    new_book = Book.model_construct(**book_request.model_dump())
     BOOKS.append(find_book_id(new_book))
+    _by_id[new_book.id] = new_book
 
 
 def find_book_id(book: Book) -> Book:
     """
-    Assign a new ID to the book based on the last book in the collection.
+    Assign the next unused ID to the book.
     Args:
         book (Book): The book to assign an ID to.
     Returns:
         Book: The book with the assigned ID.
     """
-    book.id = 1 if len(BOOKS) == 0 else BOOKS[-1].id + 1
+    global _next_id
+    book.id = _next_id
+    _next_id += 1
     return book
 
 
@@ -189,13 +191,12 @@ async def update_book(book: BookRequest) -> None:
     Raises:
         HTTPException: If the book is not found.
     """
-    book_changed = False
-    for i in range(len(BOOKS)):
-        if BOOKS[i].id == book.id:
-            BOOKS[i] = book
-            book_changed = True
-    if not book_changed:
+    old_book = _by_id.get(book.id)
+    if old_book is None:
         raise HTTPException(status_code=404, detail="Item not found")
+    new_book = Book(**book.model_dump())
+    BOOKS[BOOKS.index(old_book)] = new_book
+    _by_id[new_book.id] = new_book
 
 
 @app.delete("/books/{book_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -207,11 +208,7 @@ async def delete_book(book_id: int = Path(gt=0)) -> None:
     Raises:
         HTTPException: If the book is not found.
     """
-    book_changed = False
-    for i in range(len(BOOKS)):
-        if BOOKS[i].id == book_id:
-            BOOKS.pop(i)
-            book_changed = True
-            break
-    if not book_changed:
+    book = _by_id.pop(book_id, None)
+    if book is None:
         raise HTTPException(status_code=404, detail="Item not found")
+    BOOKS.remove(book)
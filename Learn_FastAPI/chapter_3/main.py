@@ -1,6 +1,9 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Path
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, status, Path, Query
+from fastapi.responses import ORJSONResponse
 from typing import Annotated
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 import models
 from models import Todos
 from database import engine, get_db
@@ -18,16 +21,34 @@ class TodoRequest(BaseModel):
     complete: bool
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the database tables on startup.
+    """
+    async with engine.begin() as connection:
+        await connection.run_sync(models.Base.metadata.create_all)
+    yield
+
 
-models.Base.metadata.create_all(bind=engine)
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
-db_dependency = Annotated[Session, Depends(get_db)]
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
 
 
 @app.get("/")
-async def read_all(db: db_dependency):
-    return db.query(Todos).all()
+async def read_all(
+    db: db_dependency,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, gt=0, le=200),
+):
+    """
+    Fetch a page of todo items ordered by ID.
+    """
+    result = await db.scalars(
+        select(Todos).order_by(Todos.id).offset(skip).limit(limit)
+    )
+    return result.all()
 
 
 @app.get("/todo/{todo_id}", status_code=status.HTTP_200_OK)
@@ -35,7 +56,7 @@ async def read_todo(db: db_dependency, todo_id: int = Path(gt=0)):
     """
     Fetch a single todo item by its ID.
     """
-    todo = db.query(Todos).filter(Todos.id == todo_id).first()
+    todo = await db.get(Todos, todo_id)
     if not todo:
         raise HTTPException(status_code=404, detail="Todo not found")
     return todo
@@ -46,10 +67,10 @@ async def create_todo(db: db_dependency, todo_request: TodoRequest):
     """
     Create a new todo item.
     """
-    todo_model = Todos(**todo_request.dict())
+    todo_model = Todos(**todo_request.model_dump())
     db.add(todo_model)
-    db.commit()
-    db.refresh(todo_model)
+    await db.commit()
+    await db.refresh(todo_model)
     return todo_model
 
 
@@ -60,23 +81,21 @@ async def update_todo(
     """
     Update an existing todo item by its ID.
     Args:
-        db (Session): Database session dependency.
+        db (AsyncSession): Database session dependency.
         todo_request (TodoRequest): The updated todo data.
         todo_id (int): The ID of the todo to update.
     Raises:
         HTTPException: If the todo is not found.
     """
-    todo_model = db.query(Todos).filter(Todos.id == todo_id).first()
-    if todo_model is None:
+    result = await db.execute(
+        update(Todos)
+        .where(Todos.id == todo_id)
+        .values(**todo_request.model_dump())
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Todo not found.")
-
-    todo_model.title = todo_request.title
-    todo_model.description = todo_request.description
-    todo_model.priority = todo_request.priority
-    todo_model.complete = todo_request.complete
-
-    db.add(todo_model)
-    db.commit()
+    await db.commit()
 
 
 @app.delete("/todo/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -84,13 +103,16 @@ async def delete_todo(db: db_dependency, todo_id: int = Path(gt=0)):
     """
     Delete a todo item by its ID.
     Args:
-        db (Session): Database session dependency.
+        db (AsyncSession): Database session dependency.
         todo_id (int): The ID of the todo to delete.
     Raises:
         HTTPException: If the todo is not found.
     """
-    todo_model = db.query(Todos).filter(Todos.id == todo_id).first()
-    if todo_model is None:
+    result = await db.execute(
+        delete(Todos)
+        .where(Todos.id == todo_id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Todo not found.")
-    db.query(Todos).filter(Todos.id == todo_id).delete()
-    db.commit()
+    await db.commit()
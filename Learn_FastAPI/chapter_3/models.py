@@ -14,8 +14,8 @@ class Users(Base):
     __tablename__: str = "users"
 
     id: Column = Column(Integer, primary_key=True, index=True)
-    email: Column = Column(String, unique=True)
-    username: Column = Column(String, unique=True)
+    email: Column = Column(String, unique=True, index=True)
+    username: Column = Column(String, unique=True, index=True)
     first_name: Column = Column(String)
     last_name: Column = Column(String)
     hashed_password: Column = Column(String)
@@ -36,4 +36,4 @@ class Todos(Base):
     description: Column = Column(String)
     priority: Column = Column(Integer)
     complete: Column = Column(Boolean, default=False)
-    owner_id: Column = Column(Integer, ForeignKey("users.id"))
+    owner_id: Column = Column(Integer, ForeignKey("users.id"), index=True)
@@ -5,11 +5,12 @@ This module sets up the FastAPI app, initializes the database tables, and includ
 """
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from .models import Base
 from .database import engine
 from .routers import auth, todos, admin, users
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 Base.metadata.create_all(bind=engine)
 
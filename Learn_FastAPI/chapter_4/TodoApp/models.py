@@ -27,8 +27,8 @@ class Users(Base):
     __tablename__ = "users"
 
     id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, unique=True)
-    username = Column(String, unique=True)
+    email = Column(String, unique=True, index=True)
+    username = Column(String, unique=True, index=True)
     first_name = Column(String)
     last_name = Column(String)
     hashed_password = Column(String)
@@ -57,4 +57,4 @@ class Todos(Base):
     description = Column(String)
     priority = Column(Integer)
     complete = Column(Boolean, default=False)
-    owner_id = Column(Integer, ForeignKey("users.id"))
+    owner_id = Column(Integer, ForeignKey("users.id"), index=True)
@@ -6,7 +6,7 @@ Includes routes for admin users to view and delete all todos.
 
 from typing import Annotated
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from starlette import status
 from ..models import Todos
 from ..database import SessionLocal
@@ -27,17 +27,22 @@ def get_db():
 
 
 db_dependency = Annotated[Session, Depends(get_db)]
-user_dependency = Annotated[dict, Depends(get_current_user)]
+user_dependency = Annotated[dict, Depends(get_current_user, use_cache=True)]
 
 
 @router.get("/todo", status_code=status.HTTP_200_OK)
-async def read_all(user: user_dependency, db: db_dependency):
+async def read_all(
+    user: user_dependency,
+    db: db_dependency,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, gt=0, le=200),
+):
     """
-    Retrieve all todo items. Only accessible by admin users.
+    Retrieve a page of todo items ordered by ID. Only accessible by admin users.
     """
     if user is None or user.get("user_role") != "admin":
         raise HTTPException(status_code=401, detail="Authentication Failed")
-    return db.query(Todos).all()
+    return db.query(Todos).order_by(Todos.id).offset(skip).limit(limit).all()
 
 
 @router.delete("/todo/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -49,8 +54,9 @@ async def delete_todo(
     """
     if user is None or user.get("user_role") != "admin":
         raise HTTPException(status_code=401, detail="Authentication Failed")
-    todo_model = db.query(Todos).filter(Todos.id == todo_id).first()
-    if todo_model is None:
+    deleted = (
+        db.query(Todos).filter(Todos.id == todo_id).delete(synchronize_session=False)
+    )
+    if deleted == 0:
         raise HTTPException(status_code=404, detail="Todo not found.")
-    db.query(Todos).filter(Todos.id == todo_id).delete()
     db.commit()
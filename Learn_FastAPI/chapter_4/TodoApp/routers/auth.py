@@ -4,7 +4,11 @@ Authentication-related API endpoints and utilities for the FastAPI application i
 Includes user registration, login, JWT token creation, and authentication dependencies.
 """
 
+import hashlib
+import threading
+import time
 from datetime import timedelta, datetime, timezone
+from functools import lru_cache
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
@@ -14,7 +18,9 @@ from ..database import SessionLocal
 from ..models import Users
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
-from jose import jwt, JWTError
+from starlette.concurrency import run_in_threadpool
+import jwt
+from jwt import InvalidTokenError
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -23,6 +29,25 @@ ALGORITHM = "HS256"
 
 bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl="auth/token")
+# Bearer token extracted once per request and shared by every dependency using it.
+token_dependency = Annotated[str, Depends(oauth2_bearer, use_cache=True)]
+
+# Successful bcrypt verifications, keyed by (sha256(password), stored hash).
+VERIFY_CACHE_TTL = 60
+VERIFY_CACHE_SIZE = 1024
+_verify_cache: dict[tuple[str, str], float] = {}
+# verify_password runs in threadpool threads; guards every read and eviction.
+_verify_cache_lock = threading.Lock()
+
+
+def _credentials_exc() -> HTTPException:
+    """
+    Build the 401 raised for every failed login or token check.
+    A fresh instance per raise, so no traceback or context outlives its request.
+    """
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate user."
+    )
 
 
 def get_db():
@@ -75,6 +100,28 @@ class Token(BaseModel):
     token_type: str
 
 
+def verify_password(password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against its bcrypt hash.
+    Successful checks are cached for VERIFY_CACHE_TTL seconds so repeated logins
+    skip bcrypt. The plaintext is never stored, and a password change produces a
+    new hash, which invalidates the entry.
+    """
+    key = (hashlib.sha256(password.encode()).hexdigest(), hashed_password)
+    now = time.monotonic()
+    with _verify_cache_lock:
+        expires = _verify_cache.get(key)
+    if expires is not None and expires > now:
+        return True
+    if not bcrypt_context.verify(password, hashed_password):
+        return False
+    with _verify_cache_lock:
+        if len(_verify_cache) >= VERIFY_CACHE_SIZE:
+            _verify_cache.pop(next(iter(_verify_cache)))
+        _verify_cache[key] = now + VERIFY_CACHE_TTL
+    return True
+
+
 def authenticate_user(username: str, password: str, db):
     """
     Authenticate a user by username and password.
@@ -83,7 +130,7 @@ def authenticate_user(username: str, password: str, db):
     user = db.query(Users).filter(Users.username == username).first()
     if not user:
         return False
-    if not bcrypt_context.verify(password, user.hashed_password):
+    if not verify_password(password, user.hashed_password):
         return False
     return user
 
@@ -100,26 +147,33 @@ def create_access_token(
     return jwt.encode(encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-async def get_current_user(token: Annotated[str, Depends(oauth2_bearer)]):
+@lru_cache(maxsize=4096)
+def _decode_token(token: str) -> dict:
+    """
+    Verify and decode a JWT, caching the payload per token.
+    Expiry is checked again by the caller because cached entries outlive it.
+    """
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+
+async def get_current_user(token: token_dependency):
     """
     Dependency to retrieve the current user from the JWT token.
     Raises HTTPException if the token is invalid or missing required fields.
     """
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        user_id: int = payload.get("id")
-        user_role: str = payload.get("role")
-        if username is None or user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate user.",
-            )
-        return {"username": username, "id": user_id, "user_role": user_role}
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate user."
-        )
+        payload = _decode_token(token)
+    except InvalidTokenError:
+        raise _credentials_exc() from None
+    expires = payload.get("exp")
+    username: str = payload.get("sub")
+    user_id: int = payload.get("id")
+    user_role: str = payload.get("role")
+    if (expires is not None and expires <= time.time()) or (
+        username is None or user_id is None
+    ):
+        raise _credentials_exc()
+    return {"username": username, "id": user_id, "user_role": user_role}
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
@@ -149,11 +203,12 @@ async def login_for_access_token(
     """
     Authenticate a user and return a JWT access token if successful.
     """
-    user = authenticate_user(form_data.username, form_data.password, db)
+    # bcrypt is CPU-bound; keep it off the event loop.
+    user = await run_in_threadpool(
+        authenticate_user, form_data.username, form_data.password, db
+    )
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate user."
-        )
+        raise _credentials_exc()
     token = create_access_token(
         user.username, user.id, user.role, timedelta(minutes=20)
     )
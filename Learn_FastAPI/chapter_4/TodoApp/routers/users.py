@@ -29,7 +29,7 @@ def get_db():
 
 
 db_dependency = Annotated[Session, Depends(get_db)]
-user_dependency = Annotated[dict, Depends(get_current_user)]
+user_dependency = Annotated[dict, Depends(get_current_user, use_cache=True)]
 bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
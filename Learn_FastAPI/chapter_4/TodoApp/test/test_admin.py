@@ -29,6 +29,16 @@ def test_admin_read_all_authenticated(test_todo) -> None:
     ]
 
 
+def test_admin_read_all_paginated(test_todo) -> None:
+    """Test that admin todo listing honours skip and limit."""
+    response = client.get("/admin/todo", params={"skip": 1, "limit": 10})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == []
+
+    response = client.get("/admin/todo", params={"limit": 500})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 def test_admin_delete_todo(test_todo) -> None:
     """Test that an admin can delete a todo item."""
     response = client.delete("/admin/todo/1")
@@ -13,8 +13,10 @@ from ..routers.auth import (
     ALGORITHM,
     get_current_user,
 )
-from jose import jwt
+from ..routers import auth
+import jwt
 from datetime import timedelta
+import time
 import pytest
 from fastapi import HTTPException
 
@@ -36,6 +38,19 @@ def test_authenticate_user(test_user) -> None:
     assert wrong_password_user is False
 
 
+def test_authenticate_user_caches_verification(test_user, monkeypatch) -> None:
+    """Test that a repeated successful login skips bcrypt verification."""
+    db = TestingSessionLocal()
+    assert authenticate_user(test_user.username, "testpassword", db)
+
+    def fail_verify(*args, **kwargs):
+        raise AssertionError("bcrypt should not run on a cache hit")
+
+    monkeypatch.setattr(auth.bcrypt_context, "verify", fail_verify)
+    authenticated_user = authenticate_user(test_user.username, "testpassword", db)
+    assert authenticated_user.username == test_user.username
+
+
 def test_create_access_token() -> None:
     """Test creation and decoding of JWT access token."""
     username = "testuser"
@@ -75,3 +90,18 @@ async def test_get_current_user_missing_payload() -> None:
 
     assert excinfo.value.status_code == 401
     assert excinfo.value.detail == "Could not validate user."
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_cached_token_expires(monkeypatch) -> None:
+    """Test that a cached token is rejected once it has expired."""
+    token = create_access_token("testuser", 1, "user", timedelta(minutes=5))
+    user = await get_current_user(token=token)
+    assert user == {"username": "testuser", "id": 1, "user_role": "user"}
+
+    later = time.time() + 600
+    monkeypatch.setattr(auth.time, "time", lambda: later)
+    with pytest.raises(HTTPException) as excinfo:
+        await get_current_user(token=token)
+
+    assert excinfo.value.status_code == 401
@@ -1,21 +1,31 @@
 """
 Main entry point for the FastAPI application in Chapter 5.
 
-This module sets up the FastAPI app, initializes the database tables, mounts static files, and includes routers for authentication, todos, admin, and users.
+This module sets up the FastAPI app, initializes the database tables on startup, mounts static files, and includes routers for authentication, todos, admin, and users.
 """
 
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, status
 from .models import Base
 from .database import engine
 from .routers import auth, todos, admin, users
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse
 
-app = FastAPI()
 
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create missing tables once at startup and release pooled connections on shutdown.
+    """
+    Base.metadata.create_all(bind=engine)
+    yield
+    engine.dispose()
+
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 STATIC_DIR = os.path.join(BASE_DIR, "static")
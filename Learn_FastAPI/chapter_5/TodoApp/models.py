@@ -6,7 +6,8 @@ Defines the Users and Todos tables.
 
 from .database import Base
 from pydantic import ConfigDict
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Index
+from sqlalchemy.orm import relationship
 
 
 class Users(Base):
@@ -28,8 +29,8 @@ class Users(Base):
     __tablename__ = "users"
 
     id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, unique=True)
-    username = Column(String, unique=True)
+    email = Column(String, unique=True, index=True)
+    username = Column(String, unique=True, index=True)
     first_name = Column(String)
     last_name = Column(String)
     hashed_password = Column(String)
@@ -50,9 +51,13 @@ class Todos(Base):
         priority: Priority level of the todo.
         complete: Boolean indicating if the todo is complete.
         owner_id: Foreign key referencing the user who owns the todo.
+        owner: The owning user. Never lazy-loaded; queries that need it must
+            eager-load it (e.g. selectinload) so pages can't fall into N+1.
     """
 
     __tablename__ = "todos"
+    # Covers the per-owner listing and the owner-scoped lookups by id.
+    __table_args__ = (Index("ix_todos_owner_id_id", "owner_id", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String)
@@ -60,4 +65,5 @@ class Todos(Base):
     priority = Column(Integer)
     complete = Column(Boolean, default=False)
     owner_id = Column(Integer, ForeignKey("users.id"))
+    owner = relationship("Users", lazy="raise")
     model_config = ConfigDict(from_attributes=True)
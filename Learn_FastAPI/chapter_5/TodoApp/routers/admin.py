@@ -5,11 +5,13 @@ Includes routes for admin users to view and delete all todos.
 """
 
 from typing import Annotated
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi.responses import ORJSONResponse
 from starlette import status
 from ..models import Todos
-from ..database import SessionLocal
+from ..database import get_db
 from .auth import get_current_user
 from pydantic import ConfigDict
 from pydantic import BaseModel
@@ -27,42 +29,48 @@ class TodoResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-def get_db() -> Session:
-    """
-    Dependency that provides a database session and ensures it is closed after use.
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Only the columns TodoResponse exposes, selected as plain rows.
+TODO_COLUMNS = tuple(getattr(Todos, name) for name in TodoResponse.model_fields)
 
 
 db_dependency = Annotated[Session, Depends(get_db)]
 user_dependency = Annotated[dict, Depends(get_current_user)]
 
 
-@router.get("/todo", response_model=list[TodoResponse], status_code=status.HTTP_200_OK)
-async def read_all(user: user_dependency, db: db_dependency) -> list:
+async def require_admin(user: user_dependency) -> dict:
     """
-    Retrieve all todo items. Only accessible by admin users.
+    Dependency that returns the current user only if they have the admin role.
+    Raises HTTPException otherwise.
     """
     if user is None or user.get("user_role") != "admin":
         raise HTTPException(status_code=401, detail="Authentication Failed")
-    return db.query(Todos).all()
+    return user
+
+
+admin_dependency = Annotated[dict, Depends(require_admin)]
+
+
+@router.get("/todo", response_model=list[TodoResponse], status_code=status.HTTP_200_OK)
+def read_all(user: admin_dependency, db: db_dependency) -> ORJSONResponse:
+    """
+    Retrieve all todo items. Only accessible by admin users.
+    Rows already match TodoResponse, so they are encoded directly without a
+    second validation pass; response_model still documents the schema.
+    """
+    rows = db.execute(select(*TODO_COLUMNS)).mappings()
+    return ORJSONResponse([dict(row) for row in rows])
 
 
 @router.delete("/todo/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_todo(
-    user: user_dependency, db: db_dependency, todo_id: int = Path(gt=0)
+def delete_todo(
+    user: admin_dependency, db: db_dependency, todo_id: int = Path(gt=0)
 ) -> None:
     """
     Delete a todo item by ID. Only accessible by admin users.
     """
-    if user is None or user.get("user_role") != "admin":
-        raise HTTPException(status_code=401, detail="Authentication Failed")
-    todo_model = db.query(Todos).filter(Todos.id == todo_id).first()
-    if todo_model is None:
+    deleted = db.execute(
+        delete(Todos).where(Todos.id == todo_id).returning(Todos.id)
+    ).first()
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Todo not found.")
-    db.query(Todos).filter(Todos.id == todo_id).delete()
     db.commit()
@@ -4,27 +4,55 @@ Authentication-related API endpoints and utilities for the FastAPI application i
 Includes user registration, login, JWT token creation, authentication dependencies, and page rendering for login and registration.
 """
 
+import hashlib
+import os
+import threading
+import time
 from datetime import timedelta, datetime, timezone
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from starlette import status
-from ..database import SessionLocal
+from ..database import get_db
 from ..models import Users
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
-from jose import jwt, JWTError
-from fastapi.templating import Jinja2Templates
+import jwt
+from jwt import InvalidTokenError
+from ..templating import templates
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 SECRET_KEY = "197b2c37c391bed93fe80344fe73b806947a65e36206e05a1a23c2fa12702fe3"
 ALGORITHM = "HS256"
-
-bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Built once so jwt.encode/decode don't re-encode the key or rebuild the list.
+_JWT_KEY = SECRET_KEY.encode()
+_JWT_ALGORITHMS = [ALGORITHM]
+
+# bcrypt work factor for new hashes; existing hashes keep the rounds they were
+# created with. Defaults to passlib's 12; dev and test setups may lower it
+# through BCRYPT_ROUNDS to speed up hashing.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+bcrypt_context = CryptContext(
+    schemes=["bcrypt"], bcrypt__rounds=BCRYPT_ROUNDS, deprecated="auto"
+)
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl="auth/token")
 
+# Verified tokens, keyed by sha256(token) and held until min(exp, now + TTL).
+# Set JWT_CACHE_TTL=0 to decode every token.
+JWT_CACHE_TTL = int(os.getenv("JWT_CACHE_TTL", "10"))
+JWT_CACHE_SIZE = 10000
+_jwt_cache: dict[str, tuple[dict, float]] = {}
+
+# Recent successful logins, keyed by sha256 of the length-prefixed username and
+# password. Values hold the user id, the hash that was verified, and the expiry
+# time; never the password.
+AUTH_CACHE_TTL = 30
+AUTH_CACHE_SIZE = 1024
+_auth_cache: dict[bytes, tuple[int, str, float]] = {}
+_auth_cache_lock = threading.Lock()
+
 
 class CreateUserRequest(BaseModel):
     """
@@ -49,21 +77,8 @@ class Token(BaseModel):
     token_type: str
 
 
-def get_db() -> Session:
-    """
-    Dependency that provides a database session and ensures it is closed after use.
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 db_dependency = Annotated[Session, Depends(get_db)]
 
-templates = Jinja2Templates(directory="TodoApp/templates")
-
 
 ### Pages ###
 
@@ -89,12 +104,32 @@ def authenticate_user(username: str, password: str, db) -> object | bool:
     """
     Authenticate a user by username and password.
     Returns the user object if authentication is successful, otherwise False.
-    """
+    Repeat logins within AUTH_CACHE_TTL seconds skip bcrypt, as long as the
+    stored hash hasn't changed since it was verified.
+    """
+    # Length-prefix the username so no (username, password) pair collides
+    name = username.encode()
+    key = hashlib.sha256(b"%d:%s%s" % (len(name), name, password.encode())).digest()
+    now = time.monotonic()
+    with _auth_cache_lock:
+        cached = _auth_cache.get(key)
+    if cached is not None and cached[2] > now:
+        user = db.get(Users, cached[0])
+        if (
+            user is not None
+            and user.username == username
+            and user.hashed_password == cached[1]
+        ):
+            return user
     user = db.query(Users).filter(Users.username == username).first()
     if not user:
         return False
     if not bcrypt_context.verify(password, user.hashed_password):
         return False
+    with _auth_cache_lock:
+        if len(_auth_cache) >= AUTH_CACHE_SIZE:
+            _auth_cache.pop(next(iter(_auth_cache)))
+        _auth_cache[key] = (user.id, user.hashed_password, now + AUTH_CACHE_TTL)
     return user
 
 
@@ -107,16 +142,22 @@ def create_access_token(
     encode = {"sub": username, "id": user_id, "role": role}
     expires = datetime.now(timezone.utc) + expires_delta
     encode.update({"exp": expires})
-    return jwt.encode(encode, SECRET_KEY, algorithm=ALGORITHM)
+    return jwt.encode(encode, _JWT_KEY, algorithm=ALGORITHM)
 
 
 async def get_current_user(token: Annotated[str, Depends(oauth2_bearer)]) -> dict:
     """
     Dependency to retrieve the current user from the JWT token.
     Raises HTTPException if the token is invalid or missing required fields.
+    Verified tokens are cached for up to JWT_CACHE_TTL seconds.
     """
+    key = hashlib.sha256(token.encode()).hexdigest()
+    now = time.time()
+    cached = _jwt_cache.get(key)
+    if cached is not None and cached[1] > now:
+        return dict(cached[0])
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, _JWT_KEY, algorithms=_JWT_ALGORITHMS)
         username: str = payload.get("sub")
         user_id: int = payload.get("id")
         user_role: str = payload.get("role")
@@ -125,8 +166,16 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_bearer)]) -> dic
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate user.",
             )
-        return {"username": username, "id": user_id, "user_role": user_role}
-    except JWTError:
+        user = {"username": username, "id": user_id, "user_role": user_role}
+        if JWT_CACHE_TTL > 0:
+            expires = now + JWT_CACHE_TTL
+            if payload.get("exp") is not None:
+                expires = min(expires, payload["exp"])
+            if len(_jwt_cache) >= JWT_CACHE_SIZE:
+                _jwt_cache.pop(next(iter(_jwt_cache)))
+            _jwt_cache[key] = (user, expires)
+        return dict(user)
+    except InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate user."
         )
@@ -4,34 +4,26 @@ Todo-related API endpoints and page rendering for the FastAPI application in Cha
 Includes routes for CRUD operations on todo items and rendering todo-related pages.
 """
 
+import hashlib
+import orjson
 from pydantic import ConfigDict
 from typing import Annotated
 from pydantic import BaseModel, Field
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.orm import Session
 from fastapi import APIRouter, Depends, HTTPException, Path, Request, status
 from starlette import status
 from ..models import Todos
-from ..database import SessionLocal
+from ..database import get_db
 from .auth import get_current_user
+from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
 from starlette.responses import RedirectResponse
-from fastapi.templating import Jinja2Templates
-
-templates = Jinja2Templates(directory="TodoApp/templates")
+from ..templating import templates
 
 router = APIRouter(prefix="/todos", tags=["todos"])
 
 
-def get_db() -> Session:
-    """
-    Dependency that provides a database session and ensures it is closed after use.
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 db_dependency = Annotated[Session, Depends(get_db)]
 user_dependency = Annotated[dict, Depends(get_current_user)]
 
@@ -58,6 +50,10 @@ class TodoResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Only the columns TodoResponse exposes, selected as plain rows.
+TODO_COLUMNS = tuple(getattr(Todos, name) for name in TodoResponse.model_fields)
+
+
 def redirect_to_login():
     """
     Helper function to redirect to the login page and clear the access token cookie.
@@ -83,7 +79,9 @@ async def render_todo_page(request: Request, db: db_dependency):
         if user is None:
             return redirect_to_login()
 
-        todos = db.query(Todos).filter(Todos.owner_id == user.get("id")).all()
+        todos = await run_in_threadpool(
+            db.query(Todos).filter(Todos.owner_id == user.get("id")).all
+        )
 
         return templates.TemplateResponse(
             "todo.html", {"request": request, "todos": todos, "user": user}
@@ -123,7 +121,9 @@ async def render_edit_todo_page(request: Request, todo_id: int, db: db_dependenc
         if user is None:
             return redirect_to_login()
 
-        todo = db.query(Todos).filter(Todos.id == todo_id).first()
+        todo = await run_in_threadpool(
+            db.query(Todos).filter(Todos.id == todo_id).first
+        )
 
         return templates.TemplateResponse(
             "edit-todo.html", {"request": request, "todo": todo, "user": user}
@@ -134,17 +134,31 @@ async def render_edit_todo_page(request: Request, todo_id: int, db: db_dependenc
 
 
 ### Endpoints ###
+# The session is synchronous, so these are plain functions that FastAPI runs
+# in its threadpool instead of blocking the event loop on each query.
 @router.get("/", response_model=list[TodoResponse], status_code=status.HTTP_200_OK)
-async def read_all(user: user_dependency, db: db_dependency):
+def read_all(request: Request, user: user_dependency, db: db_dependency) -> Response:
+    """
+    Retrieve all todo items for the authenticated user.
+    Rows already match TodoResponse, so they are encoded directly without a
+    second validation pass; response_model still documents the schema.
+    The body's hash is sent as an ETag, and a matching If-None-Match gets 304.
+    """
     if user is None:
         raise HTTPException(status_code=401, detail="Authentication Failed")
-    return db.query(Todos).filter(Todos.owner_id == user.get("id")).all()
+    rows = db.execute(
+        select(*TODO_COLUMNS).where(Todos.owner_id == user.get("id"))
+    ).mappings()
+    content = orjson.dumps([dict(row) for row in rows])
+    etag = f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content, media_type="application/json", headers=headers)
 
 
 @router.get("/todo/{todo_id}", status_code=status.HTTP_200_OK)
-async def read_todo(
-    user: user_dependency, db: db_dependency, todo_id: int = Path(gt=0)
-):
+def read_todo(user: user_dependency, db: db_dependency, todo_id: int = Path(gt=0)):
     """
     Retrieve a specific todo item by ID for the authenticated user.
     """
@@ -163,7 +177,7 @@ async def read_todo(
 
 
 @router.post("/todo", status_code=status.HTTP_201_CREATED)
-async def create_todo(
+def create_todo(
     user: user_dependency,
     db: db_dependency,
     todo_request: TodoRequest = None,
@@ -179,8 +193,31 @@ async def create_todo(
     db.commit()
 
 
+@router.post("/todo/bulk", status_code=status.HTTP_201_CREATED)
+def create_todos_bulk(
+    user: user_dependency, db: db_dependency, todo_requests: list[TodoRequest]
+) -> list[int]:
+    """
+    Create several todo items for the authenticated user in one INSERT.
+    Returns the IDs of the new todos in request order.
+    """
+    if user is None:
+        raise HTTPException(status_code=401, detail="Authentication Failed")
+    if not todo_requests:
+        return []
+    rows = [
+        todo_request.model_dump() | {"owner_id": user.get("id")}
+        for todo_request in todo_requests
+    ]
+    todo_ids = db.scalars(
+        insert(Todos).returning(Todos.id, sort_by_parameter_order=True), rows
+    ).all()
+    db.commit()
+    return list(todo_ids)
+
+
 @router.put("/todo/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def update_todo(
+def update_todo(
     user: user_dependency,
     db: db_dependency,
     todo_request: TodoRequest = None,
@@ -192,26 +229,19 @@ async def update_todo(
     if user is None:
         raise HTTPException(status_code=401, detail="Authentication Failed")
 
-    todo_model = (
-        db.query(Todos)
-        .filter(Todos.id == todo_id)
-        .filter(Todos.owner_id == user.get("id"))
-        .first()
-    )
-    if todo_model is None:
+    updated = db.execute(
+        update(Todos)
+        .where(Todos.id == todo_id, Todos.owner_id == user.get("id"))
+        .values(**todo_request.model_dump())
+        .returning(Todos.id)
+    ).first()
+    if updated is None:
         raise HTTPException(status_code=404, detail="Todo not found.")
-
-    todo_model.title = todo_request.title
-    todo_model.description = todo_request.description
-    todo_model.priority = todo_request.priority
-    todo_model.complete = todo_request.complete
-
-    db.add(todo_model)
     db.commit()
 
 
 @router.delete("/todo/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_todo(
+def delete_todo(
     user: user_dependency, db: db_dependency, todo_id: int = Path(gt=0)
 ) -> None:
     """
@@ -220,16 +250,11 @@ async def delete_todo(
     if user is None:
         raise HTTPException(status_code=401, detail="Authentication Failed")
 
-    todo_model = (
-        db.query(Todos)
-        .filter(Todos.id == todo_id)
-        .filter(Todos.owner_id == user.get("id"))
-        .first()
-    )
-    if todo_model is None:
+    deleted = db.execute(
+        delete(Todos)
+        .where(Todos.id == todo_id, Todos.owner_id == user.get("id"))
+        .returning(Todos.id)
+    ).first()
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Todo not found.")
-    db.query(Todos).filter(Todos.id == todo_id).filter(
-        Todos.owner_id == user.get("id")
-    ).delete()
-
     db.commit()
@@ -10,27 +10,14 @@ from sqlalchemy.orm import Session
 from fastapi import APIRouter, Depends, HTTPException
 from starlette import status
 from ..models import Users
-from ..database import SessionLocal
-from .auth import get_current_user
-from passlib.context import CryptContext
+from ..database import get_db
+from .auth import bcrypt_context, get_current_user
 
 router = APIRouter(prefix="/user", tags=["user"])
 
 
-def get_db() -> Session:
-    """
-    Dependency that provides a database session and ensures it is closed after use.
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 db_dependency = Annotated[Session, Depends(get_db)]
 user_dependency = Annotated[dict, Depends(get_current_user)]
-bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 class UserVerification(BaseModel):
@@ -13,8 +13,10 @@ from ..routers.auth import (
     ALGORITHM,
     get_current_user,
 )
-from jose import jwt
+from ..routers import auth
+import jwt
 from datetime import timedelta
+import time
 import pytest
 from fastapi import HTTPException
 
@@ -54,6 +56,24 @@ def test_create_access_token() -> None:
     assert decoded_token["role"] == role
 
 
+def test_authenticate_user_caches_successful_login(test_user, monkeypatch) -> None:
+    """Test that a repeated login skips bcrypt until the stored hash changes."""
+    db = TestingSessionLocal()
+    assert authenticate_user(test_user.username, "testpassword", db)
+
+    def fail_verify(*args, **kwargs):
+        raise AssertionError("cached login was verified again")
+
+    monkeypatch.setattr(auth.bcrypt_context, "verify", fail_verify)
+    cached_user = authenticate_user(test_user.username, "testpassword", db)
+    assert cached_user.id == test_user.id
+
+    cached_user.hashed_password = auth.bcrypt_context.hash("otherpassword")
+    db.commit()
+    with pytest.raises(AssertionError):
+        authenticate_user(test_user.username, "testpassword", db)
+
+
 @pytest.mark.asyncio
 async def test_get_current_user_valid_token() -> None:
     """Test retrieving user from a valid JWT token."""
@@ -75,3 +95,24 @@ async def test_get_current_user_missing_payload() -> None:
 
     assert excinfo.value.status_code == 401
     assert excinfo.value.detail == "Could not validate user."
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_uses_token_cache(monkeypatch) -> None:
+    """Test that a verified token is served from the cache until it expires."""
+    encode = {"sub": "cacheduser", "id": 7, "role": "user"}
+    token = jwt.encode(encode, SECRET_KEY, algorithm=ALGORITHM)
+    expected = {"username": "cacheduser", "id": 7, "user_role": "user"}
+
+    assert await get_current_user(token=token) == expected
+
+    def fail_decode(*args, **kwargs):
+        raise AssertionError("cached token was decoded again")
+
+    monkeypatch.setattr(auth.jwt, "decode", fail_decode)
+    assert await get_current_user(token=token) == expected
+
+    later = time.time() + auth.JWT_CACHE_TTL + 1
+    monkeypatch.setattr(auth.time, "time", lambda: later)
+    with pytest.raises(AssertionError):
+        await get_current_user(token=token)
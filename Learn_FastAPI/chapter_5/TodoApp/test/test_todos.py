@@ -29,6 +29,17 @@ def test_read_all_authenticated(test_todo) -> None:
     ]
 
 
+def test_read_all_not_modified(test_todo) -> None:
+    """Test that a matching If-None-Match on the todo list returns 304."""
+    response = client.get("/todos")
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "private, no-cache"
+
+    response = client.get("/todos", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+
+
 def test_read_one_authenticated(test_todo) -> None:
     """Test retrieving a single todo by ID for an authenticated user."""
     response = client.get("/todos/todo/1")
@@ -70,6 +81,28 @@ def test_create_todo(test_todo) -> None:
     assert model.complete == request_data.get("complete")
 
 
+def test_create_todos_bulk(test_todo) -> None:
+    """Test creating several todo items in one request."""
+    request_data = [
+        {
+            "title": f"Bulk Todo {i}",
+            "description": "Bulk todo description",
+            "priority": i,
+            "complete": False,
+        }
+        for i in range(1, 4)
+    ]
+
+    response = client.post("/todos/todo/bulk", json=request_data)
+    assert response.status_code == 201
+    assert response.json() == [2, 3, 4]
+
+    db = TestingSessionLocal()
+    models = db.query(Todos).filter(Todos.id.in_([2, 3, 4])).order_by(Todos.id).all()
+    assert [model.title for model in models] == [r["title"] for r in request_data]
+    assert all(model.owner_id == 1 for model in models)
+
+
 def test_update_todo(test_todo) -> None:
     """Test updating an existing todo item."""
     request_data = {
@@ -23,13 +23,13 @@ class Task(BaseModel):
     completed: bool = False
 
 
-tasks: List[Task] = []
+tasks: dict[UUID, Task] = {}
 
 
 @app.post("/tasks/", response_model=Task)
 def create_task(task: Task) -> Task:
     """
-    Create a new task and add it to the list.
+    Create a new task and add it to the store.
 
     Args:
         task (Task): The task to create.
@@ -37,7 +37,7 @@ def create_task(task: Task) -> Task:
         Task: The created task with a generated UUID.
     """
     task.id = uuid4()
-    tasks.append(task)
+    tasks[task.id] = task
     return task
 
 
@@ -49,7 +49,7 @@ def read_tasks() -> List[Task]:
     Returns:
         List[Task]: List of all tasks.
     """
-    return tasks
+    return list(tasks.values())
 
 
 @app.get("/tasks/{task_id}", response_model=Task)
@@ -64,10 +64,10 @@ def read_task(task_id: UUID) -> Task:
     Raises:
         HTTPException: If the task is not found.
     """
-    for task in tasks:
-        if task.id == task_id:
-            return task
-    raise HTTPException(status_code=404, detail="Task not found")
+    task = tasks.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
 
 
 @app.put("/tasks/{task_id}", response_model=Task)
@@ -83,12 +83,15 @@ def update_task(task_id: UUID, task_update: Task) -> Task:
     Raises:
         HTTPException: If the task is not found.
     """
-    for idx, task in enumerate(tasks):
-        if task.id == task_id:
-            updated_task = task.copy(update=task_update.dict(exclude_unset=True))
-            tasks[idx] = updated_task
-            return updated_task
-    raise HTTPException(status_code=404, detail="Task not found")
+    task = tasks.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    # The id is the store key, so it can't be changed through an update.
+    updated_task = task.model_copy(
+        update=task_update.model_dump(exclude_unset=True, exclude={"id"})
+    )
+    tasks[task_id] = updated_task
+    return updated_task
 
 
 @app.delete("/tasks/{task_id}", response_model=Task)
@@ -103,10 +106,10 @@ def delete_task(task_id: UUID) -> Task:
     Raises:
         HTTPException: If the task is not found.
     """
-    for idx, task in enumerate(tasks):
-        if task.id == task_id:
-            return tasks.pop(idx)
-    raise HTTPException(status_code=404, detail="Task not found")
+    task = tasks.pop(task_id, None)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
 
 
 if __name__ == "__main__":
@@ -6,44 +6,206 @@ Users can add money to their portfolio, buy/sell assets using live prices from B
 
 """
 
-import requests
+import asyncio
+import hashlib
+import json
+import secrets
+import threading
+import time
+from contextlib import asynccontextmanager
+
+import httpx
 import jwt
-from datetime import datetime
 
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from starlette.concurrency import run_in_threadpool
+from passlib.context import CryptContext
+
+from sqlalchemy import (
+    create_engine,
+    event,
+    func,
+    insert,
+    inspect,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import selectinload, sessionmaker, Session
 
 from .models import Base, User, Asset, Portfolio, Transaction
 from .schemas import UserCreate, AddMoney, TradeAsset
 
-app = FastAPI(title="Portfolio Tracker")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Closes the shared Binance HTTP client on shutdown.
+    """
+    yield
+    await http_client.aclose()
+
+
+app = FastAPI(
+    title="Portfolio Tracker", default_response_class=ORJSONResponse, lifespan=lifespan
+)
 
 # OAuth2 password flow
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-# Enable CORS for all origins
+# Enable CORS for all origins. Only the methods and headers the frontend
+# uses are allowed, and browsers may cache the preflight for a day.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
-    allow_credentials=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_credentials=True,
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,
 )
 
 # SQLite database setup
 engine = create_engine(
-    "sqlite:///./crypto_portfolio.db", connect_args={"check_same_thread": False}
+    "sqlite:///./crypto_portfolio.db",
+    connect_args={"check_same_thread": False},
+    pool_size=10,
+    pool_pre_ping=True,
 )
+
+# WAL lets readers run alongside a writer; synchronous=NORMAL drops the
+# per-commit fsync, and the larger cache/mmap keep hot pages in memory.
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "cache_size=-64000",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",
+)
+
+
+@event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Apply SQLITE_PRAGMAS to each new SQLite connection.
+    """
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base.metadata.create_all(bind=engine)
 
+# create_all skips indexes on tables that already exist, so add them explicitly
+for table in Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+
+def _purchase_total(expr, portfolio_id, symbol):
+    """
+    Builds a scalar subquery summing `expr` over the buy transactions of a symbol.
+    """
+    return (
+        select(func.coalesce(func.sum(expr), 0))
+        .where(
+            Transaction.portfolio_id == portfolio_id,
+            Transaction.symbol == symbol,
+            Transaction.quantity > 0,
+        )
+        .scalar_subquery()
+    )
+
+
+def _migrate_asset_cost_basis() -> None:
+    """
+    Adds the running cost-basis columns to databases created before they existed
+    and backfills them from the transaction history.
+    """
+    columns = {column["name"] for column in inspect(engine).get_columns("assets")}
+    if "total_cost_basis" in columns:
+        return
+    with engine.begin() as connection:
+        for column in ("total_cost_basis", "total_bought_quantity"):
+            connection.execute(
+                text(f"ALTER TABLE assets ADD COLUMN {column} FLOAT NOT NULL DEFAULT 0")
+            )
+        connection.execute(
+            update(Asset).values(
+                total_cost_basis=_purchase_total(
+                    Transaction.quantity * Transaction.price,
+                    Asset.portfolio_id,
+                    Asset.symbol,
+                ),
+                total_bought_quantity=_purchase_total(
+                    Transaction.quantity, Asset.portfolio_id, Asset.symbol
+                ),
+            )
+        )
+
+
+_migrate_asset_cost_basis()
+
+# Shared async HTTP client so Binance calls reuse pooled keep-alive connections
+# without blocking the event loop
+BINANCE_PRICE_URL = "https://api.binance.com/api/v3/ticker/price"
+# Short connect/read timeouts; the transport retries failed connects twice
+BINANCE_CONNECT_TIMEOUT = 1
+BINANCE_READ_TIMEOUT = 2
+BINANCE_CONNECT_RETRIES = 2
+http_client = httpx.AsyncClient(
+    timeout=httpx.Timeout(BINANCE_READ_TIMEOUT, connect=BINANCE_CONNECT_TIMEOUT),
+    transport=httpx.AsyncHTTPTransport(
+        retries=BINANCE_CONNECT_RETRIES,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+    ),
+)
+# Caps concurrent per-symbol requests to stay inside Binance's rate limits
+BINANCE_CONCURRENCY = 10
+_binance_semaphore = asyncio.Semaphore(BINANCE_CONCURRENCY)
+
+# Recently fetched prices, keyed by upper-cased symbol: (price, expires_at).
+# Failed lookups (0.0) are never cached.
+PRICE_CACHE_TTL = 5
+PRICE_CACHE_SIZE = 512
+_price_cache: dict[str, tuple[float, float]] = {}
+_price_cache_lock = threading.Lock()
+
 # Secret key for JWT encoding/decoding
 # SECRET_KEY = secrets.token_urlsafe(32)
 SECRET_KEY = "your_secret_key_here"
+# Built once so jwt.encode/decode don't re-encode the key or rebuild the list
+JWT_ALGORITHM = "HS256"
+_JWT_KEY = SECRET_KEY.encode()
+_JWT_ALGORITHMS = [JWT_ALGORITHM]
+
+# Password hashing. Accounts created before hashing was added are upgraded
+# from their plaintext password on their next successful login.
+bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# Recent successful logins, keyed by sha256 of the length-prefixed username and
+# password. Values hold the user id, the hash that was verified, and the expiry
+# time; never the password.
+LOGIN_CACHE_TTL = 60
+LOGIN_CACHE_SIZE = 1024
+_login_cache: dict[bytes, tuple[int, str, float]] = {}
+_login_cache_lock = threading.Lock()
+
+# Recently verified tokens, keyed by sha256(token): (user_id, expires_at).
+# Hits skip the HS256 check and resolve the user by primary key.
+TOKEN_CACHE_TTL = 30
+TOKEN_CACHE_SIZE = 10000
+_token_cache: dict[bytes, tuple[int, float]] = {}
+_token_cache_lock = threading.Lock()
+
+# Every authenticated endpoint goes through user.portfolio, and /portfolio
+# through its assets, so load both with the user instead of lazily
+_USER_LOAD_OPTIONS = (selectinload(User.portfolio).selectinload(Portfolio.assets),)
 
 
 def get_db():
@@ -65,34 +227,126 @@ def get_current_user(
 ) -> User:
     """
     Validates JWT token and fetches the associated user.
+    Recently verified tokens are served from a short-lived cache.
     Raises:
         HTTPException: 401 if token is invalid or user not found.
     """
+    key = hashlib.sha256(token.encode()).digest()
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+    if entry is not None and entry[1] > time.monotonic():
+        user = db.get(User, entry[0], options=_USER_LOAD_OPTIONS)
+        if user:
+            return user
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-        user = db.query(User).filter(User.username == payload["username"]).first()
+        payload = jwt.decode(token, _JWT_KEY, algorithms=_JWT_ALGORITHMS)
+        user = (
+            db.query(User)
+            .options(*_USER_LOAD_OPTIONS)
+            .filter(User.username == payload["username"])
+            .first()
+        )
         if not user:
             raise HTTPException(status_code=401, detail="Invalid user")
+        with _token_cache_lock:
+            if len(_token_cache) >= TOKEN_CACHE_SIZE:
+                _token_cache.pop(next(iter(_token_cache)))
+            _token_cache[key] = (user.id, time.monotonic() + TOKEN_CACHE_TTL)
         return user
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid token")
 
 
-def get_crypto_price(symbol: str) -> float:
+def _get_cached_price(symbol: str) -> float | None:
+    """
+    Returns the cached price for a symbol if it is still fresh, otherwise None.
+    """
+    with _price_cache_lock:
+        entry = _price_cache.get(symbol.upper())
+    if entry is not None and entry[1] > time.monotonic():
+        return entry[0]
+    return None
+
+
+def _cache_prices(prices: dict[str, float]) -> None:
+    """
+    Stores freshly fetched prices for PRICE_CACHE_TTL seconds.
+    """
+    expires_at = time.monotonic() + PRICE_CACHE_TTL
+    with _price_cache_lock:
+        for symbol, price in prices.items():
+            if not price:
+                continue
+            if len(_price_cache) >= PRICE_CACHE_SIZE:
+                _price_cache.pop(next(iter(_price_cache)))
+            _price_cache[symbol.upper()] = (price, expires_at)
+
+
+async def get_crypto_price(symbol: str) -> float:
     """
     Fetches the real-time USDT price of a cryptocurrency symbol from Binance.
+    Prices are served from a short-lived cache when available.
 
     Returns:
         float: Current market price in USDT.
     """
+    cached = _get_cached_price(symbol)
+    if cached is not None:
+        return cached
     try:
-        response = requests.get(
-            f"https://api.binance.com/api/v3/ticker/price?symbol={symbol.upper()}USDT"
-        )
-        return float(response.json()["price"])
+        async with _binance_semaphore:
+            response = await http_client.get(
+                BINANCE_PRICE_URL, params={"symbol": f"{symbol.upper()}USDT"}
+            )
+        price = float(response.json()["price"])
     except Exception as e:
         print(f"Error fetching price for {symbol}: {e}")
         return 0.0
+    _cache_prices({symbol: price})
+    return price
+
+
+async def get_crypto_prices(symbols: list[str]) -> dict[str, float]:
+    """
+    Fetches real-time USDT prices for several symbols with one Binance request.
+    Cached prices are reused and only the missing symbols are requested.
+    Falls back to concurrent per-symbol requests if the batch call fails
+    (e.g. one unknown symbol).
+
+    Returns:
+        dict[str, float]: Current market price in USDT, keyed by the given symbol.
+    """
+    prices = {}
+    # Symbols differing only in case share a pair, and each gets its price
+    pairs: dict[str, list[str]] = {}
+    for symbol in symbols:
+        cached = _get_cached_price(symbol)
+        if cached is not None:
+            prices[symbol] = cached
+        else:
+            pairs.setdefault(f"{symbol.upper()}USDT", []).append(symbol)
+    if not pairs:
+        return prices
+    try:
+        async with _binance_semaphore:
+            response = await http_client.get(
+                BINANCE_PRICE_URL,
+                params={"symbols": json.dumps(list(pairs), separators=(",", ":"))},
+            )
+        response.raise_for_status()
+        by_pair = {item["symbol"]: float(item["price"]) for item in response.json()}
+    except Exception as e:
+        print(f"Error fetching batch prices for {list(pairs)}: {e}")
+        missing = [group[0] for group in pairs.values()]
+        results = await asyncio.gather(*(get_crypto_price(s) for s in missing))
+        by_pair = dict(zip(pairs, results))
+    else:
+        _cache_prices({pairs[pair][0]: price for pair, price in by_pair.items()})
+    for pair, group in pairs.items():
+        price = by_pair.get(pair, 0.0)
+        for symbol in group:
+            prices[symbol] = price
+    return prices
 
 
 @app.post("/register")
@@ -103,7 +357,7 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     Returns:
         dict: Confirmation message.
     """
-    db_user = User(username=user.username, password=user.password)
+    db_user = User(username=user.username, password=bcrypt_context.hash(user.password))
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
@@ -115,6 +369,49 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     return {"message": "Successfully created new user."}
 
 
+def authenticate_user(username: str, password: str, db: Session) -> User | None:
+    """
+    Checks a username and password against the stored hash.
+    Repeat logins within LOGIN_CACHE_TTL seconds skip bcrypt, as long as the
+    stored hash hasn't changed since it was verified.
+
+    Returns:
+        User | None: The authenticated user, or None if the credentials are wrong.
+    """
+    # Length-prefix the username so no (username, password) pair collides
+    name = username.encode()
+    key = hashlib.sha256(b"%d:%s%s" % (len(name), name, password.encode())).digest()
+    now = time.monotonic()
+    with _login_cache_lock:
+        cached = _login_cache.get(key)
+    if cached is not None and cached[2] > now:
+        user = db.get(User, cached[0])
+        if (
+            user is not None
+            and user.username == username
+            and user.password == cached[1]
+        ):
+            return user
+
+    user = db.query(User).filter(User.username == username).first()
+    if not user:
+        return None
+    if bcrypt_context.identify(user.password) is None:
+        # Legacy plaintext password: compare it, then store a hash instead
+        if not secrets.compare_digest(user.password.encode(), password.encode()):
+            return None
+        user.password = bcrypt_context.hash(password)
+        db.commit()
+    elif not bcrypt_context.verify(password, user.password):
+        return None
+
+    with _login_cache_lock:
+        if len(_login_cache) >= LOGIN_CACHE_SIZE:
+            _login_cache.pop(next(iter(_login_cache)))
+        _login_cache[key] = (user.id, user.password, now + LOGIN_CACHE_TTL)
+    return user
+
+
 @app.post("/login")
 def login(
     form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
@@ -125,11 +422,11 @@ def login(
     Returns:
         dict: Access token and token type.
     """
-    user = db.query(User).filter(User.username == form_data.username).first()
-    if not user or user.password != form_data.password:
+    user = authenticate_user(form_data.username, form_data.password, db)
+    if not user:
         raise HTTPException(status_code=400, detail="Information invalid")
 
-    token = jwt.encode({"username": user.username}, SECRET_KEY, algorithm="HS256")
+    token = jwt.encode({"username": user.username}, _JWT_KEY, algorithm=JWT_ALGORITHM)
 
     return {"access_token": token, "token_type": "bearer"}
 
@@ -154,67 +451,84 @@ def add_money(
     return {"message": "Successfully added money"}
 
 
-@app.post("/buy")
-def buy_asset(
-    trade: TradeAsset,
-    user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
+def _record_buy(
+    db: Session, portfolio: Portfolio, trade: TradeAsset, price: float
+) -> None:
     """
-    Buys a crypto asset and updates the portfolio and transaction log.
-
-    Returns:
-        dict: Confirmation message.
+    Applies a buy at a known price: checks funds, updates the position and
+    logs the transaction. Blocking DB work, run in the threadpool.
     """
-    portfolio = user.portfolio
-    price = get_crypto_price(trade.symbol)
     total_cost = price * trade.quantity
 
     if total_cost > portfolio.available_money:
         raise HTTPException(status_code=400, detail="Insufficient funds")
 
-    asset = (
-        db.query(Asset)
-        .filter(Asset.portfolio_id == portfolio.id, Asset.symbol == trade.symbol)
-        .first()
-    )
-
-    if asset:
-        asset.quantity += trade.quantity
-    else:
-        asset = Asset(
-            portfolio_id=portfolio.id, symbol=trade.symbol, quantity=trade.quantity
-        )
-        db.add(asset)
+    # Only buys count towards the running cost basis
+    bought = trade.quantity > 0
+    cost_delta = total_cost if bought else 0.0
+    quantity_delta = trade.quantity if bought else 0.0
 
-    transaction = Transaction(
+    # Open the position or add to it in one statement. A reopened position
+    # is seeded with any earlier buys of the same symbol.
+    upsert = sqlite_insert(Asset).values(
         portfolio_id=portfolio.id,
         symbol=trade.symbol,
         quantity=trade.quantity,
-        price=price,
-        timestamp=datetime.utcnow(),
+        total_cost_basis=_purchase_total(
+            Transaction.quantity * Transaction.price, portfolio.id, trade.symbol
+        )
+        + cost_delta,
+        total_bought_quantity=_purchase_total(
+            Transaction.quantity, portfolio.id, trade.symbol
+        )
+        + quantity_delta,
+    )
+    db.execute(
+        upsert.on_conflict_do_update(
+            index_elements=[Asset.portfolio_id, Asset.symbol],
+            set_={
+                "quantity": Asset.quantity + trade.quantity,
+                "total_cost_basis": Asset.total_cost_basis + cost_delta,
+                "total_bought_quantity": Asset.total_bought_quantity + quantity_delta,
+            },
+        )
+    )
+    db.execute(
+        insert(Transaction).values(
+            portfolio_id=portfolio.id,
+            symbol=trade.symbol,
+            quantity=trade.quantity,
+            price=price,
+        )
     )
-
-    db.add(transaction)
     portfolio.available_money -= total_cost
     db.commit()
 
-    return {"message": "Asset successfully bought."}
-
 
-@app.post("/sell")
-def sell_asset(
+@app.post("/buy")
+async def buy_asset(
     trade: TradeAsset,
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
-    Sells a crypto asset and updates the portfolio and transaction log.
+    Buys a crypto asset and updates the portfolio and transaction log.
+    The price is fetched on the event loop; the DB work runs in the threadpool.
 
     Returns:
         dict: Confirmation message.
     """
-    portfolio = user.portfolio
+    price = await get_crypto_price(trade.symbol)
+    await run_in_threadpool(_record_buy, db, user.portfolio, trade, price)
+
+    return {"message": "Asset successfully bought."}
+
+
+def _held_asset(db: Session, portfolio: Portfolio, trade: TradeAsset) -> Asset:
+    """
+    Returns the position a sell draws from, or raises if it is too small.
+    Blocking DB work, run in the threadpool.
+    """
     asset = (
         db.query(Asset)
         .filter(Asset.portfolio_id == portfolio.id, Asset.symbol == trade.symbol)
@@ -223,8 +537,16 @@ def sell_asset(
 
     if not asset or asset.quantity < trade.quantity:
         raise HTTPException(status_code=400, detail="Not enough to sell")
+    return asset
 
-    price = get_crypto_price(trade.symbol)
+
+def _record_sell(
+    db: Session, portfolio: Portfolio, asset: Asset, trade: TradeAsset, price: float
+) -> None:
+    """
+    Applies a sell at a known price: reduces the position and logs the
+    transaction. Blocking DB work, run in the threadpool.
+    """
     total_value = price * trade.quantity
 
     asset.quantity -= trade.quantity
@@ -232,23 +554,41 @@ def sell_asset(
     if asset.quantity == 0:
         db.delete(asset)
 
-    transaction = Transaction(
-        portfolio_id=portfolio.id,
-        symbol=trade.symbol,
-        quantity=-trade.quantity,
-        price=price,
-        timestamp=datetime.utcnow(),
+    db.execute(
+        insert(Transaction).values(
+            portfolio_id=portfolio.id,
+            symbol=trade.symbol,
+            quantity=-trade.quantity,
+            price=price,
+        )
     )
-
-    db.add(transaction)
     portfolio.available_money += total_value
     db.commit()
 
+
+@app.post("/sell")
+async def sell_asset(
+    trade: TradeAsset,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Sells a crypto asset and updates the portfolio and transaction log.
+    The price is fetched on the event loop; the DB work runs in the threadpool.
+
+    Returns:
+        dict: Confirmation message.
+    """
+    portfolio = user.portfolio
+    asset = await run_in_threadpool(_held_asset, db, portfolio, trade)
+    price = await get_crypto_price(trade.symbol)
+    await run_in_threadpool(_record_sell, db, portfolio, asset, trade, price)
+
     return {"message": "Asset successfully sold."}
 
 
-@app.get("/portfolio")
-def get_portfolio(
+@app.get("/portfolio", response_model=None)
+async def get_portfolio(
     user: User = Depends(get_current_user), db: Session = Depends(get_db)
 ):
     """
@@ -257,68 +597,56 @@ def get_portfolio(
     - Asset breakdown
     - Performance metrics
 
+    The summary is built by hand, so it is returned as an ORJSONResponse
+    directly instead of going through FastAPI's response encoding.
+
     Returns:
-        dict: Portfolio summary.
+        ORJSONResponse: Portfolio summary.
     """
     portfolio = user.portfolio
+    assets = portfolio.assets
+    total_added = portfolio.total_added_money
+    available = portfolio.available_money
     assets_response = []
-    total_value = portfolio.available_money
+    total_value = available
+    prices = await get_crypto_prices([asset.symbol for asset in assets])
 
-    for asset in portfolio.assets:
-        current_price = get_crypto_price(asset.symbol)
+    for asset in assets:
+        symbol = asset.symbol
         net_quantity = asset.quantity
+        current_price = prices.get(symbol, 0.0)
         asset_value = current_price * net_quantity
         total_value += asset_value
 
-        transactions = (
-            db.query(Transaction)
-            .filter(
-                Transaction.portfolio_id == portfolio.id,
-                Transaction.symbol == asset.symbol,
-            )
-            .all()
+        total_bought = asset.total_bought_quantity
+        avg_purchase_price = (
+            asset.total_cost_basis / total_bought if total_bought > 0 else 0
         )
-
-        total_cost = 0
-        total_bought = 0
-
-        for t in transactions:
-            if t.quantity > 0:
-                total_cost += t.quantity * t.price
-                total_bought += t.quantity
-
-        avg_purchase_price = total_cost / total_bought if total_bought > 0 else 0
         invested_amount = avg_purchase_price * net_quantity
+        asset_diff = asset_value - invested_amount
 
         assets_response.append(
             {
-                "symbol": asset.symbol,
-                "quantity": asset.quantity,
+                "symbol": symbol,
+                "quantity": net_quantity,
                 "current_price": current_price,
                 "total_value": asset_value,
                 "avg_purchase_price": avg_purchase_price,
-                "performance_abs": asset_value - invested_amount,
+                "performance_abs": asset_diff,
                 "performance_rel": (
-                    ((asset_value - invested_amount) / invested_amount * 100)
-                    if invested_amount != 0
-                    else 0
+                    asset_diff / invested_amount * 100 if invested_amount else 0
                 ),
             }
         )
 
-    return {
-        "total_added_money": portfolio.total_added_money,
-        "available_money": portfolio.available_money,
-        "total_value": total_value,
-        "performance_abs": total_value - portfolio.total_added_money,
-        "performance_rel": (
-            (
-                (total_value - portfolio.total_added_money)
-                / portfolio.total_added_money
-                * 100
-            )
-            if portfolio.total_added_money != 0
-            else 0
-        ),
-        "assets": assets_response,
-    }
+    diff = total_value - total_added
+    return ORJSONResponse(
+        {
+            "total_added_money": total_added,
+            "available_money": available,
+            "total_value": total_value,
+            "performance_abs": diff,
+            "performance_rel": diff / total_added * 100 if total_added else 0,
+            "assets": assets_response,
+        }
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -43,7 +43,7 @@ class Portfolio(Base):
     __tablename__ = "portfolios"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     total_added_money = Column(Float, default=0)
     available_money = Column(Float, default=0)
 
@@ -61,15 +61,23 @@ class Asset(Base):
         portfolio_id (int): Foreign key referencing the associated portfolio.
         symbol (str): Symbol/ticker of the asset (e.g., 'AAPL').
         quantity (float): Number of units held.
+        total_cost_basis (float): Running cost of every buy of this symbol.
+        total_bought_quantity (float): Running quantity of every buy of this symbol.
         portfolio (Portfolio): Linked portfolio.
     """
 
     __tablename__ = "assets"
+    # Unique so buys can upsert a position with ON CONFLICT
+    __table_args__ = (
+        Index("ux_assets_portfolio_id_symbol", "portfolio_id", "symbol", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     portfolio_id = Column(Integer, ForeignKey("portfolios.id"))
     symbol = Column(String)
     quantity = Column(Float)
+    total_cost_basis = Column(Float, nullable=False, default=0, server_default="0")
+    total_bought_quantity = Column(Float, nullable=False, default=0, server_default="0")
 
     portfolio = relationship("Portfolio", back_populates="assets")
 
@@ -89,12 +97,19 @@ class Transaction(Base):
     """
 
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_portfolio_id_symbol", "portfolio_id", "symbol"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     portfolio_id = Column(Integer, ForeignKey("portfolios.id"))
     symbol = Column(String)
     quantity = Column(Float)
     price = Column(Float)
-    timestamp = Column(DateTime)
+    # Set by SQLite at insert time; `default` covers tables created before
+    # the server default existed
+    timestamp = Column(
+        DateTime, default=func.now(), server_default=func.now(), nullable=False
+    )
 
     portfolio = relationship("Portfolio", back_populates="transactions")
@@ -1,6 +1,6 @@
 # Import necessary FastAPI and Python modules
 from fastapi import FastAPI, HTTPException, status, Request, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from pydantic import BaseModel
 from typing import List, Optional
@@ -12,9 +12,10 @@ from fastapi.security import HTTPBasic, HTTPBasicCredentials
 import secrets
 import logging
 import asyncio
+import os
 
 # Initialize FastAPI app
-app = FastAPI(title="Project 2")
+app = FastAPI(title="Project 2", default_response_class=ORJSONResponse)
 
 # Set up basic logging for error tracking
 logging.basicConfig(level=logging.INFO)
@@ -31,11 +32,19 @@ class Product(BaseModel):
 # In-memory storage for products using a dictionary for O(1) access
 # Key: product id, Value: Product object
 db: dict[int, Product] = {}
-# Async lock to ensure concurrency safety for db operations
-db_lock = asyncio.Lock()
+# Per-product async locks so only writers to the same ID serialize;
+# reads are single dict operations and need no lock
+_locks: dict[int, asyncio.Lock] = {}
 
 # Set up rate limiting using slowapi (limits requests per IP)
-limiter = Limiter(key_func=get_remote_address)
+# Point RATE_LIMIT_STORAGE_URI at Redis (e.g. redis://localhost:6379/0) so all
+# workers share one set of counters; the in-process default is per worker
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    strategy="moving-window",
+)
 app.state.limiter = limiter
 
 # Set up HTTP Basic authentication
@@ -81,17 +90,23 @@ def rate_limit_handler(request: Request, exc: RateLimitExceeded):
 
 
 # Endpoint: Get all products
-@app.get("/products", response_model=List[Product], status_code=status.HTTP_200_OK)
+@app.get(
+    "/products",
+    response_model=None,
+    responses={200: {"model": List[Product]}},
+    status_code=status.HTTP_200_OK,
+)
 @limiter.limit("5/minute")
 async def get_all_products(
     request: Request, credentials: HTTPBasicCredentials = Depends(authenticate)
 ):
     """
     Returns a list of all products in the database.
+    Products were validated on write, so they are dumped straight to
+    ORJSONResponse without response-model validation.
     Requires authentication and is rate limited.
     """
-    async with db_lock:
-        return list(db.values())
+    return ORJSONResponse([product.model_dump() for product in db.values()])
 
 
 # Endpoint: Get a single product by ID
@@ -108,11 +123,10 @@ async def get_one_product(
     Returns a single product by its ID.
     Raises 404 if not found. Requires authentication and is rate limited.
     """
-    async with db_lock:
-        product = db.get(product_id)
-        if product:
-            return product
-        raise HTTPException(status_code=404, detail="Product not found")
+    product = db.get(product_id)
+    if product:
+        return product
+    raise HTTPException(status_code=404, detail="Product not found")
 
 
 # Endpoint: Create a new product
@@ -128,7 +142,7 @@ async def create_product(
     Raises 400 if product with the same ID exists.
     Requires authentication and is rate limited.
     """
-    async with db_lock:
+    async with _locks.setdefault(product.id, asyncio.Lock()):
         if product.id in db:
             raise HTTPException(
                 status_code=400, detail="Product with this ID already exists"
@@ -152,7 +166,7 @@ async def update_product(
     Updates an existing product by ID.
     Raises 404 if product not found. Requires authentication and is rate limited.
     """
-    async with db_lock:
+    async with _locks.setdefault(product_id, asyncio.Lock()):
         if product_id in db:
             db[product_id] = product
             return product
@@ -171,7 +185,7 @@ async def delete_product(
     Deletes a product by its ID.
     Raises 404 if product not found. Requires authentication and is rate limited.
     """
-    async with db_lock:
+    async with _locks.setdefault(product_id, asyncio.Lock()):
         if product_id in db:
             del db[product_id]
             return
@@ -1,5 +1,5 @@
 from fastapi import FastAPI, HTTPException, status, Depends, Request
-from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from pydantic import BaseModel, Field, conint, confloat
@@ -10,6 +10,7 @@ from slowapi.errors import RateLimitExceeded
 import secrets
 import logging
 import asyncio
+import bisect
 import time
 import os
 
@@ -17,10 +18,19 @@ import os
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Project 2 - Improved Inventory Service")
+app = FastAPI(
+    title="Project 2 - Improved Inventory Service",
+    default_response_class=ORJSONResponse,
+)
 
-# Rate limiter
-limiter = Limiter(key_func=get_remote_address)
+# Rate limiter, shared across workers when RATE_LIMIT_STORAGE_URI points at
+# Redis (e.g. redis://localhost:6379/0)
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    strategy="moving-window",
+)
 app.state.limiter = limiter
 
 # Basic auth
@@ -67,11 +77,22 @@ class ErrorResponse(BaseModel):
 _db: Dict[int, Product] = {}
 _locks: Dict[int, asyncio.Lock] = {}
 
+# (quantity, id) pairs kept sorted so low-stock queries are a bisect + slice
+_by_quantity: List[Tuple[int, int]] = []
+
 # Cache for low-stock alerts
 _alerts_cache: Dict[int, Tuple[float, List[Product]]] = {}
 _CACHE_TTL = 5.0
 
 
+def _index_quantity(prod: Product) -> None:
+    bisect.insort(_by_quantity, (prod.quantity, prod.id))
+
+
+def _unindex_quantity(prod: Product) -> None:
+    del _by_quantity[bisect.bisect_left(_by_quantity, (prod.quantity, prod.id))]
+
+
 # Exception handlers
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -115,6 +136,7 @@ async def create_product(product_in: ProductIn, credentials=Depends(authenticate
             )
         prod = Product(**product_in.dict())
         _db[prod.id] = prod
+        _index_quantity(prod)
         return prod
 
 
@@ -154,8 +176,10 @@ async def update_inventory(
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Insufficient stock."
             )
+        _unindex_quantity(prod)
         prod.quantity = new_qty
         prod.version += 1
+        _index_quantity(prod)
     return prod
 
 
@@ -166,22 +190,26 @@ async def low_stock_alerts(threshold: int = 10, credentials=Depends(authenticate
     ts, data = _alerts_cache.get(threshold, (0.0, []))
     if now - ts < _CACHE_TTL:
         return data
-    result = [p for p in _db.values() if p.quantity <= threshold]
+    end = bisect.bisect_right(_by_quantity, (threshold, float("inf")))
+    result = [_db[pid] for _, pid in _by_quantity[:end]]
     _alerts_cache[threshold] = (now, result)
     return result
 
 
 @limiter.limit("10/minute")
-@app.get("/products", response_model=List[Product])
+@app.get("/products", response_model=None, responses={200: {"model": List[Product]}})
 async def list_products(credentials=Depends(authenticate)):
-    # No lock needed for read-only
-    return list(_db.values())
+    # No lock needed for read-only; products were validated on write, so
+    # skip response-model validation
+    return ORJSONResponse([p.model_dump() for p in _db.values()])
 
 
 # Notes:
 # - Split input/output models and added validation.
 # - Per-ID locks for concurrency safety instead of global locks.
-# - TTL cache for low-stock alerts to reduce scanning.
+# - Quantity-sorted index so low-stock alerts are a bisect, not a scan.
+# - TTL cache for low-stock alerts to absorb read bursts.
 # - Unified error responses and semantic status codes.
 # - Centralized auth via dependency and rate limiting via decorators.
+# - Set RATE_LIMIT_STORAGE_URI to Redis to share rate limits across workers.
 # - Swap in async DB/Redis for production scaling.
@@ -151,6 +151,98 @@ async def test_bulk_update():
         assert data["test2"]["quantity"] == 2
 
 
+@pytest.mark.asyncio
+async def test_bulk_update_is_atomic():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        req = {
+            "updates": [
+                {
+                    "product_id": "test1",
+                    "update": {"operation": "add", "quantity": 2},
+                    "version": 1,
+                },
+                {
+                    "product_id": "test1",
+                    "update": {"operation": "subtract", "quantity": 50},
+                    "version": 2,
+                },
+            ]
+        }
+        r = await ac.post("/products/bulk", json=req, headers={"X-Client-Id": "user1"})
+        assert r.status_code == status.HTTP_400_BAD_REQUEST
+        assert "Insufficient stock" in r.json()["detail"]
+        prod = manager._inventory["test1"]
+        assert prod.quantity == 10
+        assert prod.version == 1
+
+
+@pytest.mark.asyncio
+async def test_update_circuit_breaker(monkeypatch):
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    original = manager.update_with_version
+    broken = True
+
+    async def flaky_update(*args):
+        if broken:
+            raise RuntimeError("storage unavailable")
+        return await original(*args)
+
+    monkeypatch.setattr(manager, "update_with_version", flaky_update)
+    monkeypatch.setattr(manager, "CBR_RESET", 0.05)
+    payload = {"operation": "add", "quantity": 1}
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+
+        async def put(version=1, client="user1"):
+            r = await ac.put(
+                f"/products/test1?version={version}",
+                json=payload,
+                headers={"X-Client-Id": client},
+            )
+            return r.status_code
+
+        # Client errors never open the circuit
+        broken = False
+        for _ in range(manager.CBR_THRESHOLD):
+            assert await put(version=99, client="user2") == 400
+        assert manager._circuit["update_product"]["state"] == "closed"
+        # closed -> open after CBR_THRESHOLD server errors
+        broken = True
+        for _ in range(manager.CBR_THRESHOLD):
+            assert await put() == 500
+        assert manager._circuit["update_product"]["state"] == "open"
+        assert await put() == status.HTTP_503_SERVICE_UNAVAILABLE
+        # open -> half-open after the cooldown; a failed probe reopens it
+        await asyncio.sleep(0.06)
+        assert await put() == 500
+        assert manager._circuit["update_product"]["state"] == "open"
+        assert await put() == status.HTTP_503_SERVICE_UNAVAILABLE
+        # half-open -> closed after a successful probe
+        await asyncio.sleep(0.06)
+        broken = False
+        assert await put() == status.HTTP_200_OK
+        assert manager._circuit["update_product"]["state"] == "closed"
+        assert await put(version=2) == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+async def test_metrics_counts_dropped_sse_updates():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        q = asyncio.Queue(maxsize=1)
+        manager._subscribers["test1"].add(q)
+        try:
+            dropped = manager.sse_dropped
+            manager.publish(q, b"first")
+            manager.publish(q, b"second")
+            assert q.get_nowait() == b"second"
+            r = await ac.get("/metrics")
+            assert r.status_code == status.HTTP_200_OK
+            assert r.json() == {"sse_subscribers": 1, "sse_dropped": dropped + 1}
+        finally:
+            manager._subscribers.pop("test1", None)
+
+
 @pytest.mark.asyncio
 async def test_webhook_supplier_update():
     transport = ASGITransport(app=app)